@@ -5,11 +5,39 @@ from functools import partial, wraps
 from abc import abstractmethod
 import zipfile
 import shutil
+import hashlib
+import threading
+import queue
+from collections import OrderedDict
+import socket
+import socketserver
+import inspect
+import time
+import signal
+import stat
+import sys
+import argparse
+
+
+PREFETCH_RADIUS = 10
+BITMAP_CACHE_SIZE = 32
+DAEMON_SOCKET = os.path.abspath('./daemon.sock')
+# Unix sockets are not available on every platform, the daemon is only usable where they are
+UnixStreamServer = getattr(socketserver, 'UnixStreamServer', object)
+
+
+def write_file_atomic(path, text):
+    # Write to a temporary file first so readers never see a partially written file
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
 
 
 class JSONFile():
     def __init__(self, path) -> None:
         self.path = path
+        self.saver = None
 
         if os.path.exists(path):
             with open(path, 'r') as f:
@@ -26,11 +54,19 @@ class JSONFile():
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             result = func(self, *args, **kwargs)
-            with open(self.path, 'w') as f:
-                json.dump(self.content, f, indent=1)
+            self.save()
             return result
         return wrapper
 
+    def save(self):
+        if self.saver is not None:
+            self.saver.schedule(self)
+        else:
+            self.write_file(json.dumps(self.content, indent=1))
+
+    def write_file(self, text):
+        write_file_atomic(self.path, text)
+
 
 class ModFile():
     def __init__(self, path) -> None:
@@ -42,7 +78,7 @@ class ModFile():
 
         content = {}
         for i,line in enumerate(lines):
-            if line.startswith('}'):
+            if line.startswith('}') or '=' not in line:
                 continue
             name = line.split('=')[0]
             value = line.split('=')[1].strip('"')
@@ -83,8 +119,7 @@ class UserSettings(JSONFile):
         content = {
             'euiv_docs_folder':''
         }
-        with open(self.path, 'w') as f:
-            json.dump(content, f, indent=1)
+        write_file_atomic(self.path, json.dumps(content, indent=1))
 
         return content
 
@@ -113,21 +148,22 @@ class ModCollection(JSONFile):
         euiv_mods_folder = os.path.join(SETTINGS.get_setting('euiv_docs_folder'),'mod')
         content = {'mods':[],'sets':{},'loaded':None}
         content['mods'] = ['mod/'+file for file in os.listdir(euiv_mods_folder) if '.mod' in file]
-        with open(self.path, 'w') as f:
-            json.dump(content, f, indent=1)
+        write_file_atomic(self.path, json.dumps(content, indent=1))
         return content
 
     def import_mod(self, mod_zip_file, mod_name):
         euiv_docs_folder = SETTINGS.get_setting('euiv_docs_folder')
         if euiv_docs_folder == "":
-            ErrorDialog(self, 'Please set the EUIV documents folder in Settings.')
-            return
+            raise ValueError('Please set the EUIV documents folder in Settings.')
+
+        mod_name = mod_name.replace(" ","_")
+        if mod_name != "" and not self.is_valid_mod_name(mod_name):
+            raise ValueError('Mod names cannot contain path separators or "..".')
 
         euiv_mods_folder = os.path.join(euiv_docs_folder,'mod')
         os.makedirs(euiv_mods_folder, exist_ok=True)
         zipfile.ZipFile(mod_zip_file).extractall(TEMP_FOLDER)
         
-        mod_name = mod_name.replace(" ","_")
         if mod_name == "":
             mod_name = os.listdir(TEMP_FOLDER)[0].replace('.mod','')
         else:
@@ -136,8 +172,8 @@ class ModCollection(JSONFile):
         try:
             self.add_mod(mod_name)
         except ValueError:
-            ErrorDialog(self, 'Mod name already taken. Please provide a different name.')
-            return
+            shutil.rmtree(TEMP_FOLDER, ignore_errors=True)
+            raise ValueError('Mod name already taken. Please provide a different name.')
             
         ext_mod_file, int_mod_file = self.find_mod_files(TEMP_FOLDER)
 
@@ -185,12 +221,22 @@ class ModCollection(JSONFile):
         return ModFile(ext_mod_file), ModFile(int_mod_file)
 
     def delete_mod(self, mod_name):
+        # Names can come from any daemon client, so never delete anything outside the collection
+        if not self.is_valid_mod_name(mod_name) \
+           or self.internal_mod_name(mod_name) not in self.content['mods']:
+            raise ValueError(f'"{mod_name}" is not a mod in the collection.')
+
         euiv_mods_folder = os.path.join(SETTINGS.get_setting('euiv_docs_folder'),'mod')
         mod_file = os.path.join(os.path.join(euiv_mods_folder, mod_name+'.mod'))
         mod_folder = os.path.join(os.path.join(euiv_mods_folder, mod_name))
         os.remove(mod_file)
         shutil.rmtree(mod_folder, ignore_errors=True)
 
+    @staticmethod
+    def is_valid_mod_name(mod_name):
+        return mod_name != '' and '..' not in mod_name \
+               and not any(sep in mod_name for sep in ['/', '\\', os.sep])
+
     @staticmethod
     def internal_mod_name(ext_mod_name):
         return f'mod/{ext_mod_name}.mod'
@@ -237,12 +283,19 @@ class ModCollection(JSONFile):
     def delete_set(self, set_name):
         del self.content['sets'][set_name]
 
+    @JSONFile._update_file
+    def rename_set(self, set_name, new_name):
+        if new_name in self.content['sets'].keys():
+            raise ValueError
+        self.content['sets'][new_name] = self.content['sets'].pop(set_name)
+        if self.content['loaded'] == set_name:
+            self.content['loaded'] = new_name
+
     @JSONFile._update_file
     def load_set(self, set_name):
         euiv_docs_folder = SETTINGS.get_setting('euiv_docs_folder')
         if euiv_docs_folder == "":
-            ErrorDialog(self, 'Please set the EUIV documents folder in Settings.')
-            return
+            raise ValueError('Please set the EUIV documents folder in Settings.')
 
         dlc_load_path = os.path.join(euiv_docs_folder, 'dlc_load.json')
         if os.path.exists(dlc_load_path):
@@ -256,8 +309,7 @@ class ModCollection(JSONFile):
         else:
             dlc_load['enabled_mods'] = self.content['sets'][set_name]
 
-        with open(dlc_load_path, 'w') as f:
-            json.dump(dlc_load, f)
+        write_file_atomic(dlc_load_path, json.dumps(dlc_load))
         
         self.content['loaded'] = set_name
 
@@ -276,6 +328,373 @@ class ModCollection(JSONFile):
         return self.content['loaded']
 
 
+class PreviewCache():
+    def __init__(self, cache_folder, thumb_size=(96,96), max_bytes=16*1024*1024) -> None:
+        self.cache_folder = cache_folder
+        self.thumb_size = thumb_size
+        self.max_bytes = max_bytes
+        os.makedirs(cache_folder, exist_ok=True)
+
+        # thumbnail file key -> (wx.Image, size in bytes), least recently used first
+        self.entries = OrderedDict()
+        self.used_bytes = 0
+        # thumbnail file key -> wx.Bitmap, only ever touched from the GUI thread
+        self.bitmaps = OrderedDict()
+        # descriptor path -> (file key, content)
+        self.descriptors = {}
+        self.lock = threading.Lock()
+
+        self.prefetch_queue = queue.Queue()
+        threading.Thread(target=self._prefetch_worker, daemon=True).start()
+
+    @staticmethod
+    def thumbnail_path(euiv_docs_folder, mod_name, descriptor):
+        # Mods installed by this tool have a path relative to the documents folder, 
+        # while Workshop mods point to an absolute folder, which os.path.join keeps as-is
+        mod_folder = descriptor.get('path', f'mod/{mod_name}')
+        return os.path.join(euiv_docs_folder, mod_folder, 'thumbnail.png')
+
+    @staticmethod
+    def _file_key(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_mtime_ns, st.st_size)
+
+    def get_preview(self, mod_name):
+        euiv_docs_folder = SETTINGS.get_setting('euiv_docs_folder')
+        descriptor = self._load_descriptor(os.path.join(euiv_docs_folder, 'mod', mod_name+'.mod'))
+        bitmap = self._get_bitmap(self.thumbnail_path(euiv_docs_folder, mod_name, descriptor))
+        return bitmap, descriptor
+
+    def _get_bitmap(self, thumbnail_path):
+        key = self._file_key(thumbnail_path)
+        if key is None:
+            return None
+        if key in self.bitmaps:
+            self.bitmaps.move_to_end(key)
+            return self.bitmaps[key]
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is not None:
+            image = entry[0]
+        else:
+            image = self._load_image(thumbnail_path)
+            if image is None:
+                return None
+            self._store(key, image)
+
+        # The shared cache only holds wx.Images, bitmaps are created and dropped in the GUI thread
+        bitmap = wx.Bitmap(image)
+        self.bitmaps[key] = bitmap
+        while len(self.bitmaps) > BITMAP_CACHE_SIZE:
+            self.bitmaps.popitem(last=False)
+        return bitmap
+
+    def prefetch(self, mod_names):
+        while not self.prefetch_queue.empty():
+            try:
+                self.prefetch_queue.get_nowait()
+            except queue.Empty:
+                break
+        euiv_docs_folder = SETTINGS.get_setting('euiv_docs_folder')
+        for mod_name in mod_names:
+            self.prefetch_queue.put((euiv_docs_folder, mod_name))
+
+    def prefetch_visible(self, mod_names, top, count, margin=PREFETCH_RADIUS):
+        if count <= 0: # Not every platform reports how many rows fit in the list
+            count = margin
+        rows = list(range(top, top+count))
+        for offset in range(1, margin+1):
+            rows += [top+count-1+offset, top-offset]
+        self.prefetch([mod_names[i] for i in rows if 0 <= i < len(mod_names)])
+
+    def _prefetch_worker(self):
+        while True:
+            euiv_docs_folder, mod_name = self.prefetch_queue.get()
+            descriptor = self._load_descriptor(os.path.join(euiv_docs_folder, 'mod', mod_name+'.mod'))
+            thumbnail_path = self.thumbnail_path(euiv_docs_folder, mod_name, descriptor)
+
+            key = self._file_key(thumbnail_path)
+            if key is None:
+                continue
+            with self.lock:
+                if key in self.entries:
+                    continue
+            image = self._load_image(thumbnail_path)
+            if image is not None:
+                self._store(key, image)
+
+    def _load_descriptor(self, path):
+        key = self._file_key(path)
+        if key is None:
+            return {}
+        
+        with self.lock:
+            cached = self.descriptors.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        try:
+            content = ModFile(path).read()
+        except (OSError, IndexError, UnicodeDecodeError):
+            content = {}
+        with self.lock:
+            self.descriptors[path] = (key, content)
+        return content
+
+    def _load_image(self, path):
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+
+        width, height = self.thumb_size
+        cached_path = os.path.join(self.cache_folder, f'{digest}_{width}x{height}.png')
+        if os.path.exists(cached_path):
+            image = wx.Image(cached_path, wx.BITMAP_TYPE_PNG)
+            if image.IsOk():
+                return image
+
+        if not wx.Image.CanRead(path):
+            return None
+        image = wx.Image(path, wx.BITMAP_TYPE_ANY)
+        if not image.IsOk():
+            return None
+
+        scale = min(width/image.GetWidth(), height/image.GetHeight(), 1)
+        image = image.Scale(max(1, int(image.GetWidth()*scale)), 
+                            max(1, int(image.GetHeight()*scale)), 
+                            wx.IMAGE_QUALITY_HIGH)
+        
+        temp_path = f'{cached_path}.{threading.get_ident()}.tmp'
+        if image.SaveFile(temp_path, wx.BITMAP_TYPE_PNG):
+            os.replace(temp_path, cached_path)
+        return image
+
+    def _store(self, key, image):
+        size = image.GetWidth() * image.GetHeight() * 4
+        with self.lock:
+            if key in self.entries:
+                self.used_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (image, size)
+            self.used_bytes += size
+
+            while self.used_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.used_bytes -= evicted_size
+
+
+class AsyncSaver():
+    def __init__(self, lock, delay=0.5) -> None:
+        self.lock = lock
+        self.delay = delay
+        self.pending = set()
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def schedule(self, json_file):
+        with self.condition:
+            self.pending.add(json_file)
+            self.condition.notify()
+
+    def flush(self):
+        with self.write_lock:
+            with self.condition:
+                pending, self.pending = self.pending, set()
+            
+            failed, error = set(), None
+            for json_file in pending:
+                with self.lock:
+                    text = json.dumps(json_file.content, indent=1)
+                try:
+                    json_file.write_file(text)
+                except OSError as e:
+                    failed.add(json_file)
+                    error = e
+
+            if failed:
+                # Keep unsaved files pending, so they are written on the next attempt
+                with self.condition:
+                    self.pending |= failed
+                raise error
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+            # Let bursts of mutations settle before writing
+            time.sleep(self.delay)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f'Could not save changes, retrying in {self.delay}s: {e}', file=sys.stderr)
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except (ValueError, UnicodeDecodeError):
+                response = ModManagerDaemon.error_response(None, -32700, 'Parse error')
+            else:
+                response = self.server.dispatch(request)
+            
+            if response is not None:
+                self.wfile.write(json.dumps(response).encode()+b'\n')
+
+
+class ModManagerDaemon(socketserver.ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+    collection_methods = ['import_mod', 'add_mod', 'remove_mod', 'create_set', 'delete_set', 
+                          'rename_set', 'load_set', 'get_mods', 'get_sets', 'get_loaded_set']
+    settings_methods = ['get_setting', 'is_setting_valid', 'update_setting']
+
+    def __init__(self, socket_path, collection:ModCollection, settings:UserSettings) -> None:
+        if os.path.lexists(socket_path):
+            if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                raise RuntimeError(f'"{socket_path}" already exists and is not a socket.')
+            try:
+                DaemonClient(socket_path).close()
+            except OSError:
+                os.remove(socket_path) # Left behind by a daemon that did not shut down cleanly
+            else:
+                raise RuntimeError(f'A daemon is already listening on "{socket_path}".')
+
+        self.bound = False
+        self.closing = False
+        # All calls go through this lock, so mutations are applied one at a time
+        self.lock = threading.RLock()
+        self.saver = AsyncSaver(self.lock)
+        collection.saver = self.saver
+        settings.saver = self.saver
+
+        self.methods = {}
+        for name in self.collection_methods:
+            self.methods[f'collection.{name}'] = getattr(collection, name)
+        for name in self.settings_methods:
+            self.methods[f'settings.{name}'] = getattr(settings, name)
+
+        super().__init__(socket_path, DaemonRequestHandler)
+
+    @staticmethod
+    def error_response(request_id, code, message, error_type=None):
+        error = {'code':code, 'message':message}
+        if error_type is not None:
+            error['data'] = {'type':error_type}
+        return {'jsonrpc':'2.0', 'error':error, 'id':request_id}
+
+    def dispatch(self, request):
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' \
+           or not isinstance(request.get('method'), str):
+            return self.error_response(None, -32600, 'Invalid Request')
+        
+        request_id = request.get('id')
+        method = self.methods.get(request['method'])
+        if method is None:
+            return self.error_response(request_id, -32601, f'Method "{request["method"]}" not found.')
+
+        params = request.get('params', [])
+        if isinstance(params, list):
+            args, kwargs = params, {}
+        elif isinstance(params, dict):
+            args, kwargs = [], params
+        else:
+            return self.error_response(request_id, -32602, 'Params must be an array or an object.')
+        try:
+            inspect.signature(method).bind(*args, **kwargs)
+        except TypeError as e:
+            return self.error_response(request_id, -32602, str(e))
+
+        try:
+            with self.lock:
+                if self.closing:
+                    raise ConnectionError('The daemon is shutting down.')
+                result = method(*args, **kwargs)
+        except (ValueError, KeyError, ConnectionError) as e:
+            message = str(e.args[0]) if e.args else type(e).__name__
+            response = self.error_response(request_id, -32000, message, type(e).__name__)
+        except Exception as e:
+            response = self.error_response(request_id, -32603, str(e), type(e).__name__)
+        else:
+            response = {'jsonrpc':'2.0', 'result':result, 'id':request_id}
+
+        if 'id' not in request:
+            return None # Notification
+        return response
+
+    def server_bind(self):
+        super().server_bind()
+        self.bound = True
+        os.chmod(self.server_address, 0o600)
+
+    def server_close(self):
+        # Connection threads outlive the listening socket, so refuse their calls from here on
+        # to make sure nothing is acknowledged after the final flush
+        with self.lock:
+            self.closing = True
+        super().server_close()
+        self.saver.flush()
+        # Only unlink the socket if this process created it
+        if self.bound and os.path.lexists(self.server_address):
+            os.remove(self.server_address)
+
+
+class DaemonClient():
+    error_types = {'ValueError':ValueError, 'KeyError':KeyError, 'ConnectionError':ConnectionError}
+
+    def __init__(self, socket_path) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(socket_path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.rfile = self.sock.makefile('rb')
+        self.lock = threading.Lock()
+        self.next_id = 0
+
+    def call(self, method, *args, **kwargs):
+        if args and kwargs:
+            raise TypeError('JSON-RPC calls take either positional or keyword arguments, not both.')
+        
+        with self.lock:
+            self.next_id += 1
+            request = {'jsonrpc':'2.0', 'method':method, 'params':kwargs or list(args), 'id':self.next_id}
+            self.sock.sendall(json.dumps(request).encode()+b'\n')
+            line = self.rfile.readline()
+        if not line:
+            raise ConnectionError('The daemon closed the connection.')
+
+        response = json.loads(line)
+        if 'error' in response:
+            error = response['error']
+            error_type = self.error_types.get(error.get('data', {}).get('type'), RuntimeError)
+            raise error_type(error['message'])
+        return response['result']
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+
+class RemoteObject():
+    def __init__(self, client:DaemonClient, namespace) -> None:
+        self.client = client
+        self.namespace = namespace
+
+    def __getattr__(self, name):
+        return partial(self.client.call, f'{self.namespace}.{name}')
+
+
 class ErrorDialog(wx.MessageDialog):
     def __init__(self, parent, message, 
                  caption="Error", style=wx.OK | wx.ICON_ERROR,
@@ -285,6 +704,17 @@ class ErrorDialog(wx.MessageDialog):
         self.Destroy()
 
 
+def handle_connection_errors(handler):
+    # When the GUI is a daemon client, a daemon that exits must not raise from wx callbacks
+    @wraps(handler)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return handler(self, *args, **kwargs)
+        except ConnectionError as e:
+            ErrorDialog(self, f'Lost the connection to the mod manager daemon: {e}')
+    return wrapper
+
+
 class TextSelector(wx.Panel):
     def __init__(self, parent, desc:str=None, default:str='', hint=None, size=(300,-1), *args, **kw):
         
@@ -362,6 +792,72 @@ class CheckListBoxNoSelection(wx.CheckListBox):
         self.Deselect(event.GetSelection())
 
 
+class VisibleRowsPrefetcher(wx.Timer):
+    # Native list boxes do not report scrolling on every platform, so poll the visible rows instead
+    def __init__(self, list_box, interval=250):
+        super().__init__()
+        self.list_box = list_box
+        self.visible = None
+        self.list_box.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+        self.Start(interval)
+
+    def Notify(self):
+        top = self.list_box.GetTopItem()
+        count = self.list_box.GetCountPerPage()
+        visible = (top, count, self.list_box.GetCount())
+        if visible == self.visible:
+            return
+        
+        self.visible = visible
+        try:
+            PREVIEW_CACHE.prefetch_visible(self.list_box.GetStrings(), top, count)
+        except ConnectionError:
+            self.Stop() # The event handlers report the lost daemon connection
+
+    def on_destroy(self, event):
+        self.Stop()
+        event.Skip()
+
+
+class ModPreview(wx.Panel):
+    def __init__(self, parent, orient=wx.VERTICAL, *args, **kw):
+        super().__init__(parent, *args, **kw)
+
+        self.thumbnail = wx.StaticBitmap(self, size=PREVIEW_CACHE.thumb_size)
+        # Fixed size, so the panel fits the wrapped text regardless of what is shown later
+        self.info_text = wx.StaticText(self, label='', size=(200,100), style=wx.ST_NO_AUTORESIZE)
+
+        box = wx.BoxSizer(orient)
+        if orient == wx.VERTICAL:
+            box.Add(self.thumbnail, flag=wx.BOTTOM, border=10)
+        else:
+            box.Add(self.thumbnail, flag=wx.RIGHT, border=10)
+        box.Add(self.info_text)
+        self.SetSizer(box)
+        box.Fit(self)
+
+    def show_mod(self, mod_name):
+        if mod_name in ['', None]:
+            self.thumbnail.SetBitmap(wx.NullBitmap)
+            self.info_text.SetLabelText('')
+            return
+
+        bitmap, descriptor = PREVIEW_CACHE.get_preview(mod_name)
+        self.thumbnail.SetBitmap(bitmap if bitmap is not None else wx.NullBitmap)
+        
+        lines = [descriptor.get('name', mod_name)]
+        if 'version' in descriptor:
+            lines.append(f"Version: {descriptor['version']}")
+        if 'supported_version' in descriptor:
+            lines.append(f"Game version: {descriptor['supported_version']}")
+        if descriptor.get('tags'):
+            lines.append(', '.join(descriptor['tags']))
+        self.info_text.SetLabelText('\n'.join(lines))
+        self.info_text.Wrap(200)
+        self.Fit()
+        self.GetParent().Layout()
+
+
 class Mods(wx.Panel): # TODO Re-do with a ListBox, so mods can also be renamed and removed
     def __init__(self, *args, **kw):
         super().__init__(*args, **kw)
@@ -390,6 +886,9 @@ class Mods(wx.Panel): # TODO Re-do with a ListBox, so mods can also be renamed a
         self.delete_button = wx.Button(self, label='Delete Mod')
         self.delete_button.Bind(wx.EVT_BUTTON, self.on_delete_mod)
 
+        self.preview = ModPreview(self)
+        self.prefetcher = VisibleRowsPrefetcher(self.mod_list_box)
+
         out_vbox = wx.BoxSizer(wx.VERTICAL)
         hbox = wx.BoxSizer(wx.HORIZONTAL)
         vbox = wx.BoxSizer(wx.VERTICAL)
@@ -404,7 +903,8 @@ class Mods(wx.Panel): # TODO Re-do with a ListBox, so mods can also be renamed a
         hbox2 = wx.BoxSizer(wx.HORIZONTAL)
         hbox2.Add(self.mod_list_box, flag=wx.RIGHT, border=20)
         vbox21 = wx.BoxSizer(wx.VERTICAL)
-        vbox21.Add(self.delete_button)
+        vbox21.Add(self.delete_button, flag=wx.BOTTOM, border=20)
+        vbox21.Add(self.preview)
         hbox2.Add(vbox21)
         vbox.Add(hbox2)
 
@@ -430,22 +930,31 @@ class Mods(wx.Panel): # TODO Re-do with a ListBox, so mods can also be renamed a
     def on_file_selected(self, event):
         self.update_button_status([self.add_button])
 
+    @handle_connection_errors
     def on_add_mod(self, event):
         mod_zip = self.file_selector.GetValue()
         mod_name = self.name_selector.GetValue()
-        MOD_COLLECTION.import_mod(mod_zip, mod_name)
+        try:
+            MOD_COLLECTION.import_mod(mod_zip, mod_name)
+        except ValueError as e:
+            ErrorDialog(self, str(e))
+            return
         self.mod_list_box.Set(MOD_COLLECTION.get_mods())
         self.file_selector.text_ctrl.Clear()
         self.name_selector.text_ctrl.Clear()
         app.sets_page.update_mod_list_box()
         
+    @handle_connection_errors
     def on_mod_selected(self, event):
         self.update_button_status([self.delete_button])
+        self.preview.show_mod(self.mod_list_box.GetStringSelection())
     
+    @handle_connection_errors
     def on_delete_mod(self, event):
         mod_name = self.mod_list_box.GetStringSelection()
         MOD_COLLECTION.remove_mod(mod_name)
         self.mod_list_box.Set(MOD_COLLECTION.get_mods())
+        self.preview.show_mod(None)
         app.sets_page.update_mod_list_box()
 
 
@@ -477,6 +986,7 @@ class ModSets(wx.Panel):
             size=(200,220),
         )
         self.mod_list_box.Bind(wx.EVT_CHECKLISTBOX, self.on_mod_selected)
+        self.mod_list_box.Bind(wx.EVT_LISTBOX, self.on_mod_clicked)
 
         self.set_name_editor = TextSelector(self, 
             hint='Rename the ModSet',
@@ -500,6 +1010,9 @@ class ModSets(wx.Panel):
             label=f'Currently loaded: {MOD_COLLECTION.get_loaded_set()}', pos=(240,365)
         )
 
+        self.preview = ModPreview(self, orient=wx.HORIZONTAL, pos=(20,400))
+        self.prefetcher = VisibleRowsPrefetcher(self.mod_list_box)
+
         self._update_button_status([self.create_set,self.rename_set,self.load_set,self.unload_set])
     
     def _update_button_status(self, buttons):
@@ -526,22 +1039,31 @@ class ModSets(wx.Panel):
             self.mod_list_box.SetCheckedStrings(set_mods)
             self._update_button_status([self.rename_set, self.delete_set, self.load_set])
 
+    @handle_connection_errors
     def on_text_edited(self, event):
         self._update_button_status([self.create_set])
 
+    @handle_connection_errors
     def on_set_selected(self, event):
         self.update_mod_list_box()
 
+    @handle_connection_errors
+    def on_mod_clicked(self, event):
+        self.preview.show_mod(event.GetString())
+        event.Skip()
+
+    @handle_connection_errors
     def on_mod_selected(self, event):
         mod = event.GetString()
         if self.mod_list_box.IsChecked(event.GetInt()):
-            MOD_COLLECTION.add_mod(mod, set_name=self.selected_set)
+            MOD_COLLECTION.add_mod(mod, self.selected_set)
         else:
-            MOD_COLLECTION.remove_mod(mod, set_name=self.selected_set)
+            MOD_COLLECTION.remove_mod(mod, self.selected_set)
         
         if self.selected_set == MOD_COLLECTION.get_loaded_set():
             MOD_COLLECTION.load_set(self.selected_set)
 
+    @handle_connection_errors
     def on_create_set(self, event):
         set_name = self.new_set_name_selector.GetValue()
         
@@ -556,32 +1078,45 @@ class ModSets(wx.Panel):
         self.set_list_box.SetStringSelection(set_name)
         self.on_set_selected(wx.EVT_LISTBOX)
 
+    @handle_connection_errors
     def on_rename_set(self, event):
-        mods = list(self.mod_list_box.GetCheckedStrings())
-
-        MOD_COLLECTION.delete_set(self.selected_set)
-        
         new_name = self.set_name_editor.GetValue()
-        MOD_COLLECTION.create_set(new_name, mods)
+        try:
+            MOD_COLLECTION.rename_set(self.selected_set, new_name)
+        except ValueError:
+            ErrorDialog(self, 'ModSet name already taken. Please provide a different name.')
+            return
 
         self.selected_set = new_name
+        self.loaded_set_text.SetLabelText(f'Currently loaded: {MOD_COLLECTION.get_loaded_set()}')
         self.set_name_editor.text_ctrl.SetLabelText('')
         self.set_list_box.Set(MOD_COLLECTION.get_sets())
         self.set_list_box.SetStringSelection(new_name)
 
+    @handle_connection_errors
     def on_delete_set(self, event):
         MOD_COLLECTION.delete_set(self.selected_set)
         self.set_list_box.Set(MOD_COLLECTION.get_sets())
         self.mod_list_box.Set([])
         self._update_button_status([self.rename_set, self.delete_set, self.load_set])
 
+    @handle_connection_errors
     def on_load_set(self, event):
-        MOD_COLLECTION.load_set(self.selected_set)
+        try:
+            MOD_COLLECTION.load_set(self.selected_set)
+        except ValueError as e:
+            ErrorDialog(self, str(e))
+            return
         self.loaded_set_text.SetLabelText(f'Currently loaded: {self.selected_set}')
         self._update_button_status([self.unload_set])
     
+    @handle_connection_errors
     def on_unload_set(self, event):
-        MOD_COLLECTION.load_set(None)
+        try:
+            MOD_COLLECTION.load_set(None)
+        except ValueError as e:
+            ErrorDialog(self, str(e))
+            return
         self.loaded_set_text.SetLabelText(f'Currently loaded: {None}')
         self._update_button_status([self.unload_set])
 
@@ -603,6 +1138,7 @@ class SettingsTab(wx.Panel):
             partial(self.on_setting_update, setting='euiv_docs_folder')
         )
 
+    @handle_connection_errors
     def on_setting_update(self, event, setting):
         text_ctrl_obj = event.GetEventObject()        
         SETTINGS.update_setting(setting, text_ctrl_obj.GetValue())
@@ -656,7 +1192,7 @@ class EUIVModManager(wx.App):
     
     def build(self):
         frame = wx.Frame(parent=None, title='EUIV Mod Manager', size=(-1,-1))
-        frame.SetSize(485,500)
+        frame.SetSize(485,580)
         frame.Center()
         frame.SetWindowStyle(wx.DEFAULT_FRAME_STYLE & ~(wx.RESIZE_BORDER | wx.MAXIMIZE_BOX))
         
@@ -673,13 +1209,59 @@ class EUIVModManager(wx.App):
         frame.Show()
     
 
+def run_daemon(socket_path):
+    global TEMP_FOLDER, SETTINGS, MOD_COLLECTION
+
+    if not hasattr(socket, 'AF_UNIX'):
+        exit('The daemon requires Unix socket support, which is not available on this platform.')
+
+    TEMP_FOLDER = os.path.abspath('./temp/')
+    SETTINGS = UserSettings('./settings.json')
+    if not SETTINGS.is_setting_valid('euiv_docs_folder'):
+        exit('The EUIV documents folder in settings.json is not valid. Run the GUI once to set it.')
+    MOD_COLLECTION = ModCollection('./collection.json')
+
+    try:
+        server = ModManagerDaemon(socket_path, MOD_COLLECTION, SETTINGS)
+    except (RuntimeError, OSError) as e:
+        exit(str(e))
+    signal.signal(signal.SIGTERM, lambda signum, frame: exit())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 def main():
-    global app, TEMP_FOLDER, SETTINGS, MOD_COLLECTION
+    global app, TEMP_FOLDER, SETTINGS, MOD_COLLECTION, PREVIEW_CACHE
+
+    parser = argparse.ArgumentParser(description='EUIV Mod Manager')
+    parser.add_argument('--daemon', action='store_true', 
+                        help='Run the management daemon instead of the GUI.')
+    parser.add_argument('--socket', default=DAEMON_SOCKET, 
+                        help='Unix socket the daemon listens on.')
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(args.socket)
+        return
+
+    client = None
+    if hasattr(socket, 'AF_UNIX') and os.path.exists(args.socket):
+        try:
+            client = DaemonClient(args.socket)
+        except OSError:
+            pass
 
     app = EUIVModManager()
 
     TEMP_FOLDER = os.path.abspath('./temp/')
-    SETTINGS = UserSettings('./settings.json')
+    if client is not None:
+        SETTINGS = RemoteObject(client, 'settings')
+    else:
+        SETTINGS = UserSettings('./settings.json')
     
     while not SETTINGS.is_setting_valid('euiv_docs_folder'):
         setup = SettingsSetup(None)
@@ -689,7 +1271,11 @@ def main():
             ErrorDialog(None, 'The selected EUIV documents folder is not valid. Please select a valid folder.')
         setup.Destroy()
 
-    MOD_COLLECTION = ModCollection('./collection.json')
+    if client is not None:
+        MOD_COLLECTION = RemoteObject(client, 'collection')
+    else:
+        MOD_COLLECTION = ModCollection('./collection.json')
+    PREVIEW_CACHE = PreviewCache('./cache/thumbnails/')
 
     app.build()
     app.MainLoop()
@@ -0,0 +1,153 @@
+import json
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip('wx')
+if not hasattr(socket, 'AF_UNIX'):
+    pytest.skip('The daemon requires Unix sockets.', allow_module_level=True)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import EUIV_Mod_Manager as manager
+
+
+def stop(server):
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    docs_folder = tmp_path/'Europa Universalis IV'
+    (docs_folder/'mod').mkdir(parents=True)
+    (tmp_path/'settings.json').write_text(json.dumps({'euiv_docs_folder':str(docs_folder)}))
+    (tmp_path/'collection.json').write_text(json.dumps({'mods':['mod/A.mod','mod/B.mod'], 'sets':{}, 'loaded':None}))
+
+    settings = manager.UserSettings(str(tmp_path/'settings.json'))
+    monkeypatch.setattr(manager, 'SETTINGS', settings, raising=False)
+    collection = manager.ModCollection(str(tmp_path/'collection.json'))
+
+    server = manager.ModManagerDaemon(str(tmp_path/'daemon.sock'), collection, settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    stop(server)
+
+
+@pytest.fixture
+def clients(daemon):
+    clients = [manager.DaemonClient(daemon.server_address) for _ in range(2)]
+    yield [manager.RemoteObject(client, 'collection') for client in clients]
+    for client in clients:
+        client.close()
+
+
+def test_concurrent_mutations_are_serialized(clients):
+    clients[0].create_set('shared', [])
+    added = []
+
+    def mutate(collection, prefix):
+        for i in range(50):
+            collection.create_set(f'{prefix}{i}', ['A'])
+            try:
+                collection.add_mod('B', 'shared')
+                added.append(prefix)
+            except ValueError:
+                pass
+
+    threads = [threading.Thread(target=mutate, args=(collection, prefix))
+               for collection, prefix in zip(clients, ['x', 'y'])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(clients[1].get_sets()) == 101
+    assert clients[1].get_mods('shared') == ['B']
+    assert len(added) == 1
+
+
+def test_errors_keep_their_type(clients, daemon):
+    clients[0].create_set('set', [])
+    with pytest.raises(ValueError):
+        clients[1].create_set('set', [])
+    with pytest.raises(KeyError):
+        clients[1].delete_set('missing')
+
+    settings = manager.RemoteObject(manager.DaemonClient(daemon.server_address), 'settings')
+    with pytest.raises(KeyError, match='not a valid setting'):
+        settings.update_setting('missing', '')
+    settings.client.close()
+
+
+def test_server_close_flushes_last_mutation(clients, daemon, tmp_path):
+    daemon.saver.delay = 60 # Nothing is written unless server_close flushes it
+    clients[0].create_set('old', ['A'])
+    clients[1].rename_set('old', 'new')
+
+    stop(daemon)
+
+    with open(tmp_path/'collection.json') as f:
+        content = json.load(f)
+    assert content['sets'] == {'new':['mod/A.mod']}
+    assert not os.path.exists(daemon.server_address)
+
+
+def test_calls_are_refused_after_server_close(clients, daemon, tmp_path):
+    stop(daemon)
+
+    with pytest.raises(ConnectionError):
+        clients[0].create_set('late', [])
+    with open(tmp_path/'collection.json') as f:
+        assert 'late' not in json.load(f)['sets']
+
+
+def test_saver_retries_failed_writes():
+    class FlakyFile():
+        content = {'sets':{}}
+        written = []
+        fail = True
+
+        def write_file(self, text):
+            if self.fail:
+                raise OSError('Disk full')
+            self.written.append(text)
+
+    saver = manager.AsyncSaver(threading.RLock(), delay=60)
+    json_file = FlakyFile()
+    saver.schedule(json_file)
+
+    with pytest.raises(OSError):
+        saver.flush()
+    assert saver.pending == {json_file}
+
+    json_file.fail = False
+    saver.flush()
+    assert json_file.written == [json.dumps(json_file.content, indent=1)]
+    assert saver.pending == set()
+
+
+def test_remove_mod_rejects_names_outside_the_collection(clients, daemon, tmp_path):
+    victim = tmp_path/'victim.mod'
+    victim.write_text('keep')
+
+    for mod_name in ['../../victim', '..', 'C']:
+        with pytest.raises(ValueError):
+            clients[0].remove_mod(mod_name)
+    assert victim.read_text() == 'keep'
+    assert clients[0].get_mods() == ['A', 'B']
+
+
+def test_socket_is_private(daemon):
+    assert os.stat(daemon.server_address).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.parametrize('line', [b'garbage\n', b'\xff\xfe\n'])
+def test_unparsable_requests_get_a_parse_error(daemon, line):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(daemon.server_address)
+        sock.sendall(line)
+        response = json.loads(sock.makefile('rb').readline())
+    assert response['error']['code'] == -32700
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import sys
+
+import pytest
+
+wx = pytest.importorskip('wx')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import EUIV_Mod_Manager as manager
+
+
+class FakeImage():
+    def __init__(self, width, height) -> None:
+        self.width = width
+        self.height = height
+
+    def GetWidth(self):
+        return self.width
+
+    def GetHeight(self):
+        return self.height
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return manager.PreviewCache(str(tmp_path/'cache'), thumb_size=(16,16), max_bytes=3*10*10*4)
+
+
+def test_store_evicts_least_recently_used_entries(cache):
+    for key in 'abc':
+        cache._store(key, FakeImage(10,10))
+    cache._store('a', FakeImage(10,10))
+    cache._store('d', FakeImage(10,10))
+
+    assert list(cache.entries) == ['c', 'a', 'd']
+    assert cache.used_bytes == 3*10*10*4
+
+
+def test_store_keeps_an_entry_larger_than_the_cap(cache):
+    cache._store('big', FakeImage(100,100))
+    assert list(cache.entries) == ['big']
+    assert cache.used_bytes == 100*100*4
+
+    cache._store('small', FakeImage(10,10))
+    assert list(cache.entries) == ['small']
+    assert cache.used_bytes == 10*10*4
+
+
+def test_storing_a_key_twice_counts_it_once(cache):
+    cache._store('a', FakeImage(10,10))
+    cache._store('a', FakeImage(5,5))
+
+    assert len(cache.entries) == 1
+    assert cache.used_bytes == 5*5*4
+
+
+def test_second_load_reuses_the_disk_cache(cache, tmp_path):
+    source = tmp_path/'thumbnail.png'
+    wx.Image(64,32).SaveFile(str(source), wx.BITMAP_TYPE_PNG)
+
+    image = cache._load_image(str(source))
+    assert (image.GetWidth(), image.GetHeight()) == (16,8)
+
+    digest = hashlib.sha1(source.read_bytes()).hexdigest()
+    cached = tmp_path/'cache'/f'{digest}_16x16.png'
+    assert cached.exists()
+
+    # Replace the cached thumbnail, so the next load shows whether it was used
+    wx.Image(4,4).SaveFile(str(cached), wx.BITMAP_TYPE_PNG)
+    image = cache._load_image(str(source))
+    assert (image.GetWidth(), image.GetHeight()) == (4,4)
+
+
+def test_descriptor_is_reloaded_when_the_file_changes(cache, tmp_path):
+    descriptor = tmp_path/'A.mod'
+    descriptor.write_text('name="A"\n')
+    assert cache._load_descriptor(str(descriptor)) == {'name':'A'}
+
+    descriptor.write_text('name="A"\nversion="2"\n')
+    assert cache._load_descriptor(str(descriptor)) == {'name':'A', 'version':'2'}
+
+
+def test_thumbnail_path_follows_the_descriptor_path(tmp_path):
+    docs_folder = str(tmp_path/'Europa Universalis IV')
+    workshop_folder = str(tmp_path/'workshop'/'123')
+
+    assert manager.PreviewCache.thumbnail_path(docs_folder, 'A', {'path':'mod/A'}) \
+        == os.path.join(docs_folder, 'mod/A', 'thumbnail.png')
+    assert manager.PreviewCache.thumbnail_path(docs_folder, 'ugc_123', {'path':workshop_folder}) \
+        == os.path.join(workshop_folder, 'thumbnail.png')
+    assert manager.PreviewCache.thumbnail_path(docs_folder, 'B', {}) \
+        == os.path.join(docs_folder, 'mod/B', 'thumbnail.png')